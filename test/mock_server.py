@@ -1,12 +1,49 @@
 import http.server
-import socketserver
 import json
 import time
 import urllib.parse
 
+try:
+    from orjson import dumps
+except ImportError:
+    # The systemd unit runs the stock /usr/bin/python3, which may not ship orjson
+    def dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 PORT = 8080
 
+# The account snapshot never changes, so it is encoded once at startup
+ACCOUNT_BYTES = dumps({
+    "makerCommission": 10,
+    "takerCommission": 10,
+    "buyerCommission": 0,
+    "sellerCommission": 0,
+    "canTrade": True,
+    "canWithdraw": True,
+    "canDeposit": True,
+    "updateTime": int(time.time() * 1000),
+    "accountType": "SPOT",
+    "balances": [
+        {"asset": "BTC", "free": "1.50000000", "locked": "0.00000000"},
+        {"asset": "ETH", "free": "10.00000000", "locked": "0.00000000"},
+        {"asset": "USDT", "free": "50000.00000000", "locked": "0.00000000"},
+        {"asset": "SOL", "free": "500.00000000", "locked": "0.00000000"},
+        {"asset": "DOGE", "free": "100000.00000000", "locked": "0.00000000"},
+    ],
+    "permissions": ["SPOT"]
+})
+
 class BinanceMockHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive; every response sets Content-Length
+    protocol_version = "HTTP/1.1"
+
+    def send_json(self, body):
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_POST(self):
         # Handle /api/v3/order
         if self.path.startswith("/api/v3/order"):
@@ -55,41 +92,18 @@ class BinanceMockHandler(http.server.SimpleHTTPRequestHandler):
                 "side": side
             }
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(dumps(response))
+        else:
+            self.send_error(404)
             
     def do_GET(self):
         # Handle /api/v3/account (Balance check)
         if self.path.startswith("/api/v3/account"):
             print("\n[MOCK BINANCE] RECEIVED ACCOUNT INFO REQUEST")
-            
-            response = {
-                "makerCommission": 10,
-                "takerCommission": 10,
-                "buyerCommission": 0,
-                "sellerCommission": 0,
-                "canTrade": True,
-                "canWithdraw": True,
-                "canDeposit": True,
-                "updateTime": int(time.time() * 1000),
-                "accountType": "SPOT",
-                "balances": [
-                    {"asset": "BTC", "free": "1.50000000", "locked": "0.00000000"},
-                    {"asset": "ETH", "free": "10.00000000", "locked": "0.00000000"},
-                    {"asset": "USDT", "free": "50000.00000000", "locked": "0.00000000"},
-                    {"asset": "SOL", "free": "500.00000000", "locked": "0.00000000"},
-                    {"asset": "DOGE", "free": "100000.00000000", "locked": "0.00000000"},
-                ],
-                "permissions": ["SPOT"]
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(ACCOUNT_BYTES)
+        else:
+            self.send_error(404)
 
 print(f"Starting Binance Mock Server on port {PORT}...")
-with socketserver.TCPServer(("", PORT), BinanceMockHandler) as httpd:
+with http.server.ThreadingHTTPServer(("", PORT), BinanceMockHandler) as httpd:
     httpd.serve_forever()
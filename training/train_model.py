@@ -2,6 +2,8 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import torch.onnx
+import onnx
+from onnxconverter_common import float16
 import numpy as np
 
 # 1. Define the Neural Network
@@ -39,17 +41,15 @@ def generate_data(n_samples=10000):
     # Random OBI between -1 and 1
     obi = np.random.uniform(-1, 1, n_samples)
     
-    targets = []
-    for r, o in zip(rsi, obi):
-        if r < 30 and o > 0.2:
-            targets.append(1.0) # STRONG BUY
-        elif r > 70 and o < -0.2:
-            targets.append(0.0) # STRONG SELL
-        else:
-            targets.append(0.5) # HOLD
+    targets = np.select(
+        [(rsi < 30) & (obi > 0.2),  # STRONG BUY
+         (rsi > 70) & (obi < -0.2)], # STRONG SELL
+        [1.0, 0.0],
+        default=0.5                  # HOLD
+    ).astype(np.float32)
             
     X = np.column_stack((rsi, obi)).astype(np.float32)
-    y = np.array(targets).astype(np.float32).reshape(-1, 1)
+    y = targets.reshape(-1, 1)
     return torch.from_numpy(X), torch.from_numpy(y)
 
 # 3. Train the Model
@@ -57,22 +57,33 @@ def train():
     print("Generating synthetic data...")
     X, y = generate_data()
     
-    model = TradingModel()
+    # ROCm builds of PyTorch also expose the GPU through torch.cuda
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    use_amp = device == 'cuda'
+    print(f"Using device: {device}")
+
+    model = TradingModel().to(device)
+    X, y = X.to(device), y.to(device)
     criterion = nn.BCELoss()
-    optimizer = optim.Adam(model.parameters(), lr=0.01)
+    optimizer = optim.AdamW(model.parameters(), lr=0.01, fused=use_amp)
+    scaler = torch.amp.GradScaler(device, enabled=use_amp)
     
     print("Training...")
     for epoch in range(500):
-        optimizer.zero_grad()
-        outputs = model(X)
-        loss = criterion(outputs, y)
-        loss.backward()
-        optimizer.step()
+        optimizer.zero_grad(set_to_none=True)
+        with torch.autocast(device, dtype=torch.float16, enabled=use_amp):
+            outputs = model(X)
+        # BCELoss is not autocast-safe, so compute it in fp32
+        loss = criterion(outputs.float(), y)
+        scaler.scale(loss).backward()
+        scaler.step(optimizer)
+        scaler.update()
         
         if epoch % 50 == 0:
             print(f"Epoch {epoch}, Loss: {loss.item():.4f}")
 
-    return model
+    # Hand back an fp32 CPU model for testing and ONNX export
+    return model.to('cpu')
 
 # 4. Export to ONNX
 def export_onnx(model, path="models/strategy.onnx"):
@@ -87,11 +98,19 @@ def export_onnx(model, path="models/strategy.onnx"):
         path, 
         input_names=['input'], 
         output_names=['output'],
-        dynamic_axes={'input': {0: 'batch_size'}, 'output': {0: 'batch_size'}},
-        dynamo=False
+        opset_version=17,
+        dynamic_shapes={'x': {0: torch.export.Dim('batch_size')}},
+        dynamo=True,
+        external_data=False # single-file model for tract
     )
     print("Success! Model exported.")
 
+    # Half-precision copy for fp16-capable runtimes; I/O stays fp32 so callers are unchanged
+    fp16_path = path.replace('.onnx', '.fp16.onnx')
+    model_fp16 = float16.convert_float_to_float16(onnx.load(path), keep_io_types=True)
+    onnx.save(model_fp16, fp16_path)
+    print(f"FP16 model exported to {fp16_path}.")
+
 if __name__ == "__main__":
     trained_model = train()
     
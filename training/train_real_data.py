@@ -2,13 +2,22 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import torch.onnx
+import onnx
+from onnxconverter_common import float16
 import numpy as np
 import pandas as pd
 import pandas_ta as ta
 import sqlite3
 import zstandard as zstd
 import os
-import subprocess
+import io
+from joblib import Parallel, delayed
+from numpy.lib.stride_tricks import sliding_window_view
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 from tqdm import tqdm
 from torch.utils.data import TensorDataset, DataLoader
 
@@ -26,15 +35,16 @@ class TradingModel(nn.Module):
         self.fc2 = nn.Linear(64, 32)
         self.fc3 = nn.Linear(32, 3) # Output logits for 3 classes
 
-    def forward(self, x):
         # Normalization (Simple scaling based on expected ranges)
-        rsi = x[:, 0].unsqueeze(1) / 100.0  # 0-100 -> 0-1
-        obi = x[:, 1].unsqueeze(1)          # -1 to 1 -> as is
-        tfi = x[:, 2].unsqueeze(1)          # -1 to 1 -> as is
+        # RSI: 0-100 -> 0-1, OBI/TFI: -1 to 1 -> as is
         # Volatility usually < 100 for crypto, but can spike. Clamp to safe range.
-        vol = torch.clamp(x[:, 3].unsqueeze(1) / 50.0, 0, 1)
+        self.register_buffer('scale', torch.tensor([1 / 100.0, 1.0, 1.0, 1 / 50.0]))
+        self.register_buffer('clamp_min', torch.tensor([-float('inf'), -float('inf'), -float('inf'), 0.0]))
+        self.register_buffer('clamp_max', torch.tensor([float('inf'), float('inf'), float('inf'), 1.0]))
 
-        features = torch.cat((rsi, obi, tfi, vol), dim=1)
+    def forward(self, x):
+        # One Mul + Clamp over the whole [B, 4] input instead of per-column slicing and cat
+        features = torch.clamp(x * self.scale, self.clamp_min, self.clamp_max)
 
         out = self.fc1(features)
         out = self.relu(out)
@@ -47,34 +57,103 @@ class TradingModel(nn.Module):
 # ==========================================
 # 2. Database Utilities
 # ==========================================
-def load_and_decompress_db(zstd_path, output_db_path="temp_db.sqlite"):
-    print(f"Importing {zstd_path} via shell pipeline...")
+def iter_dump_statements(lines):
+    """
+    Reassembles complete SQL statements from a `sqlite3 .dump` text stream.
+    The dump's own BEGIN/COMMIT are dropped so the caller controls transaction size.
+    """
+    pending = []
+    for line in lines:
+        pending.append(line)
+        if not sqlite3.complete_statement(''.join(pending)):
+            continue
+        statement = ''.join(pending)
+        pending = []
+        if statement.strip().upper() in ('BEGIN TRANSACTION;', 'COMMIT;'):
+            continue
+        yield statement
+    if pending:
+        yield ''.join(pending)
+
+def load_and_decompress_db(zstd_path, output_db_path="temp_db.sqlite", batch_bytes=64 * 1024 * 1024):
+    print(f"Importing {zstd_path} via streaming decompression...")
     if os.path.exists(output_db_path):
         os.remove(output_db_path)
     try:
-        cmd = f"zstd -dc '{zstd_path}' | sqlite3 '{output_db_path}'"
-        print(f"Executing: {cmd}")
-        retcode = subprocess.call(cmd, shell=True)
-        if retcode != 0:
-            print(f"Shell command failed with exit code {retcode}")
-            return None
+        # Autocommit mode: every executescript batch below brings its own BEGIN/COMMIT
+        conn = sqlite3.connect(output_db_path, isolation_level=None)
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+        """)
+
+        dctx = zstd.ZstdDecompressor()
+        with open(zstd_path, 'rb') as fh, dctx.stream_reader(fh) as reader:
+            sql_text = io.TextIOWrapper(reader, encoding='utf-8')
+            batch, batch_len = [], 0
+            for statement in iter_dump_statements(sql_text):
+                batch.append(statement)
+                batch_len += len(statement)
+                if batch_len >= batch_bytes:
+                    conn.executescript("BEGIN;\n" + ''.join(batch) + "\nCOMMIT;")
+                    batch, batch_len = [], 0
+            if batch:
+                conn.executescript("BEGIN;\n" + ''.join(batch) + "\nCOMMIT;")
+
+        # Let SQLite walk (symbol, time) B-trees instead of sorting whole tables on every fetch
+        print("Building (symbol, time) indexes...")
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_agg_sym_time ON agg_trades(symbol, time);
+            CREATE INDEX IF NOT EXISTS idx_ob_sym_time ON order_books(symbol, time);
+            ANALYZE;
+        """)
+        conn.close()
+
         if not os.path.exists(output_db_path) or os.path.getsize(output_db_path) == 0:
              print("Output database empty or not created.")
              return None
+
         print(f"Import complete. SQLite DB ready at {output_db_path}")
         return output_db_path
     except Exception as e:
         print(f"Error during import: {e}")
         return None
 
-def fetch_data_from_db(db_path):
+def fetch_data_from_db(db_path, chunk_rows=500_000, blob_batch_rows=50_000):
     conn = sqlite3.connect(db_path)
     print("Fetching agg_trades data...")
-    aggtrade_df = pd.read_sql_query("SELECT time, symbol, price, quantity, is_buyer_maker FROM agg_trades ORDER BY time;", conn)
+    # Stream in chunks so the full table never exists as one list of Python row tuples
+    agg_chunks = pd.read_sql_query(
+        "SELECT time, symbol, price, quantity, is_buyer_maker FROM agg_trades ORDER BY symbol, time;",
+        conn, chunksize=chunk_rows,
+        dtype={'time': 'float64', 'price': 'float64', 'quantity': 'float64', 'is_buyer_maker': 'bool'}
+    )
+    aggtrade_df = pd.concat(agg_chunks, ignore_index=True)
+
     print("Fetching order_books data...")
-    orderbook_df = pd.read_sql_query("SELECT time, symbol, bids, asks FROM order_books ORDER BY time;", conn)
+    # BLOBs are pulled straight off the cursor; pandas never converts them row by row
+    cursor = conn.execute("SELECT time, symbol, bids, asks FROM order_books ORDER BY symbol, time;")
+    ob_times, ob_symbols, ob_bids, ob_asks = [], [], [], []
+    while True:
+        batch = cursor.fetchmany(blob_batch_rows)
+        if not batch:
+            break
+        times, symbols, bids, asks = zip(*batch)
+        ob_times.extend(times)
+        ob_symbols.extend(symbols)
+        ob_bids.extend(bids)
+        ob_asks.extend(asks)
     conn.close()
 
+    orderbook_df = pd.DataFrame({
+        'time': np.asarray(ob_times, dtype=np.float64),
+        'symbol': pd.Series(ob_symbols, dtype=object),
+        'bids': pd.Series(ob_bids, dtype=object),
+        'asks': pd.Series(ob_asks, dtype=object)
+    })
+
     if 'time' in aggtrade_df.columns:
         aggtrade_df['time'] = pd.to_datetime(aggtrade_df['time'], unit='s')
     if 'time' in orderbook_df.columns:
@@ -84,134 +163,210 @@ def fetch_data_from_db(db_path):
 # ==========================================
 # 3. Feature Engineering & Labeling
 # ==========================================
-def calculate_features_and_labels(aggtrade_df, orderbook_df, interval_ms=60000):
+def triple_barrier_loop(closes, highs, lows, vols, horizon, mult, min_pct):
+    """
+    Finds the first barrier touch for every bar that has a full look-ahead window.
+    Scalar kernel meant to be compiled with numba.
+    Returns: labels (0=Hold, 1=Buy, 2=Sell), valid_idx (row positions that were labeled)
+    """
+    n = max(len(closes) - horizon, 0)
+    labels = np.zeros(n, np.int8)
+    valid_idx = np.arange(n)
+
+    for i in range(n):
+        # Dynamic Barriers
+        barrier_width = max(vols[i] * mult, closes[i] * min_pct)
+        upper_barrier = closes[i] + barrier_width
+        lower_barrier = closes[i] - barrier_width
+
+        # Look ahead
+        for j in range(1, horizon + 1):
+            touched_upper = highs[i + j] >= upper_barrier
+            touched_lower = lows[i + j] <= lower_barrier
+
+            if touched_upper and touched_lower:
+                # Touched both in same candle? rare. Assume volatility/chop -> HOLD
+                break
+            elif touched_upper:
+                labels[i] = 1 # BUY
+                break
+            elif touched_lower:
+                labels[i] = 2 # SELL
+                break
+
+    return labels, valid_idx
+
+def triple_barrier_vectorized(closes, highs, lows, vols, horizon, mult, min_pct):
+    """
+    NumPy fallback for triple_barrier_loop when numba is unavailable.
+    Compares every look-ahead window against its barriers at once and takes the first touch via argmax.
+    Returns: labels (0=Hold, 1=Buy, 2=Sell), valid_idx (row positions that were labeled)
+    """
+    n = max(len(closes) - horizon, 0)
+    labels = np.zeros(n, np.int8)
+    valid_idx = np.arange(n)
+    if n == 0:
+        return labels, valid_idx
+
+    # Row i holds bars i+1 .. i+horizon
+    future_highs = sliding_window_view(highs[1:], horizon)[:n]
+    future_lows = sliding_window_view(lows[1:], horizon)[:n]
+
+    barrier_width = np.maximum(vols[:n] * mult, closes[:n] * min_pct)
+    touched_upper = future_highs >= (closes[:n] + barrier_width)[:, None]
+    touched_lower = future_lows <= (closes[:n] - barrier_width)[:, None]
+
+    touched = touched_upper | touched_lower
+    first = touched.argmax(axis=1)
+    hit_upper = touched_upper[valid_idx, first]
+    hit_lower = touched_lower[valid_idx, first]
+
+    # Touching both in the first touched candle stays HOLD, same as the loop
+    labels[hit_upper & ~hit_lower] = 1 # BUY
+    labels[hit_lower & ~hit_upper] = 2 # SELL
+    return labels, valid_idx
+
+if HAS_NUMBA:
+    triple_barrier = njit(cache=True)(triple_barrier_loop)
+else:
+    triple_barrier = triple_barrier_vectorized
+
+def sum_level_volumes(blobs):
+    """
+    Sums the quantity column of every packed order book blob in one vectorized pass.
+    Each blob is a sequence of [Price(f32), Qty(f32)] pairs (8 bytes per level).
+    Returns: totals per blob, mask of blobs that were well-formed (NULL/truncated ones are excluded)
+    """
+    byte_lens = np.fromiter(
+        (len(b) if isinstance(b, (bytes, bytearray, memoryview)) else -1 for b in blobs),
+        dtype=np.int64, count=len(blobs)
+    )
+    valid = (byte_lens >= 0) & (byte_lens % 8 == 0)
+    lengths = np.where(valid, byte_lens // 8, 0)
+    totals = np.zeros(len(blobs), dtype=np.float64)
+
+    non_empty = lengths > 0
+    if not non_empty.any():
+        return totals, valid
+
+    buf = b''.join(b for b, ok in zip(blobs, valid) if ok)
+    levels = np.frombuffer(buf, dtype=np.float32).reshape(-1, 2)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))[:-1]
+    # reduceat misbehaves on empty segments, so only reduce over blobs that hold levels
+    totals[non_empty] = np.add.reduceat(levels[:, 1], offsets[non_empty])
+    return totals, valid
+
+def process_symbol(symbol, agg_group, current_symbol_orderbook, cfg):
+    """
+    Builds features and triple barrier labels for a single symbol.
+    Runs in a worker process, so it only touches its own slices of the data.
+    Returns: (X, y) for the symbol, or None if it produced no usable bars
+    """
+    interval = f"{cfg['interval_ms']}ms"
+    agg_group = agg_group.set_index('time').sort_index()
+
+    # --- A. OHLCV & Indicators ---
+    ohlcv = agg_group['price'].resample(interval).ohlc().dropna()
+    if ohlcv.empty: return None
+
+    # 1. RSI
+    rsi = ta.rsi(ohlcv['close'], length=14)
+
+    # 2. TFI (Volume Imbalance)
+    agg_group['vol_buy'] = np.where(agg_group['is_buyer_maker'] == False, agg_group['quantity'], 0)
+    agg_group['vol_sell'] = np.where(agg_group['is_buyer_maker'] == True, agg_group['quantity'], 0)
+    vol_resampled = agg_group[['vol_buy', 'vol_sell']].resample(interval).sum()
+    total_vol = (vol_resampled['vol_buy'] + vol_resampled['vol_sell']).to_numpy()
+    net_vol = (vol_resampled['vol_buy'] - vol_resampled['vol_sell']).to_numpy()
+    tfi = pd.Series(
+        np.divide(net_vol, total_vol, out=np.zeros_like(net_vol), where=total_vol > 0),
+        index=vol_resampled.index
+    )
+
+    # 3. Volatility (Rolling Std Dev)
+    rolling_std = ohlcv['close'].rolling(20).std()
+
+    # 4. OBI (Order Book Imbalance)
+    if current_symbol_orderbook is None:
+        ob_valid = np.zeros(0, dtype=bool)
+    else:
+        bid_vol, bids_ok = sum_level_volumes(current_symbol_orderbook['bids'].to_numpy())
+        ask_vol, asks_ok = sum_level_volumes(current_symbol_orderbook['asks'].to_numpy())
+        ob_valid = bids_ok & asks_ok
+
+    if not ob_valid.any():
+        obi_resampled = pd.Series(0, index=ohlcv.index)
+    else:
+        total = bid_vol + ask_vol
+        obi_vals = np.divide(bid_vol - ask_vol, total, out=np.zeros_like(total), where=total > 0)
+        obi_df = pd.DataFrame({
+            'time': current_symbol_orderbook['time'].to_numpy()[ob_valid],
+            'obi': obi_vals[ob_valid]
+        }).set_index('time').sort_index()
+        obi_resampled = obi_df['obi'].resample(interval).last().ffill()
+        obi_resampled = obi_resampled.reindex(ohlcv.index, method='ffill').fillna(0)
+
+    # Combine Features
+    features_df = pd.DataFrame({
+        'rsi': rsi,
+        'obi': obi_resampled,
+        'tfi': tfi,
+        'volatility': rolling_std,
+        'close': ohlcv['close'], # kept for labeling, removed later
+        'high': ohlcv['high'],   # kept for labeling
+        'low': ohlcv['low']      # kept for labeling
+    }).dropna()
+
+    if features_df.empty: return None
+
+    # --- B. Triple Barrier Labeling ---
+    closes = features_df['close'].to_numpy(dtype=np.float64)
+    highs = features_df['high'].to_numpy(dtype=np.float64)
+    lows = features_df['low'].to_numpy(dtype=np.float64)
+    vols = features_df['volatility'].to_numpy(dtype=np.float64)
+
+    labels, valid_indices = triple_barrier(
+        closes, highs, lows, vols,
+        cfg['horizon'], cfg['multiplier'], cfg['min_pct']
+    )
+
+    # Extract X and y using valid indices
+    final_X = features_df.iloc[valid_indices][['rsi', 'obi', 'tfi', 'volatility']].values
+    final_y = labels
+
+    return final_X, final_y
+
+def calculate_features_and_labels(aggtrade_df, orderbook_df, interval_ms=60000, n_jobs=-1):
     """
     Generates features and implements TRIPLE BARRIER LABELING.
+    Symbols are independent, so they are processed in parallel worker processes.
     Returns: X (Features), y (Labels: 0=Hold, 1=Buy, 2=Sell)
     """
-    all_features = []
-    all_labels = []
-    
-    # Configuration for Labeling
-    BARRIER_HORIZON = 15  # Look ahead 15 bars
-    BARRIER_MULTIPLIER = 2.0 # Upper/Lower barrier = Price +/- (Volatility * Multiplier)
+    cfg = {
+        'interval_ms': interval_ms,
+        # Configuration for Labeling
+        'horizon': 15,      # Look ahead 15 bars
+        'multiplier': 2.0,  # Upper/Lower barrier = Price +/- (Volatility * Multiplier)
+        'min_pct': 0.002,   # If vol is very low, use a minimum floor (0.2% move) to avoid noise
+    }
 
     print(f"AggTrade Rows: {len(aggtrade_df)}, OrderBook Rows: {len(orderbook_df)}")
-    
-    for symbol, agg_group in tqdm(aggtrade_df.groupby('symbol'), desc="Processing Symbols"):
-        agg_group = agg_group.set_index('time').sort_index()
-
-        # --- A. OHLCV & Indicators ---
-        ohlcv = agg_group['price'].resample(f'{interval_ms}ms').ohlc().dropna()
-        if ohlcv.empty: continue
-
-        # 1. RSI
-        rsi = ta.rsi(ohlcv['close'], length=14)
-
-        # 2. TFI (Volume Imbalance)
-        agg_group['vol_buy'] = np.where(agg_group['is_buyer_maker'] == False, agg_group['quantity'], 0)
-        agg_group['vol_sell'] = np.where(agg_group['is_buyer_maker'] == True, agg_group['quantity'], 0)
-        vol_resampled = agg_group[['vol_buy', 'vol_sell']].resample(f'{interval_ms}ms').sum()
-        total_vol = vol_resampled['vol_buy'] + vol_resampled['vol_sell']
-        tfi = (vol_resampled['vol_buy'] - vol_resampled['vol_sell']) / total_vol.replace(0, 1)
-
-        # 3. Volatility (Rolling Std Dev)
-        rolling_std = ohlcv['close'].rolling(20).std()
-
-        # 4. OBI (Order Book Imbalance)
-        current_symbol_orderbook = orderbook_df[orderbook_df['symbol'] == symbol]
-        ob_list = []
-        for idx, row in current_symbol_orderbook.iterrows():
-            try:
-                bids = np.frombuffer(row['bids'], dtype=np.float32).reshape(-1, 2)
-                asks = np.frombuffer(row['asks'], dtype=np.float32).reshape(-1, 2)
-                bid_vol = bids[:, 1].sum()
-                ask_vol = asks[:, 1].sum()
-                total = bid_vol + ask_vol
-                obi_val = (bid_vol - ask_vol) / total if total > 0 else 0
-                ob_list.append({'time': row['time'], 'obi': obi_val})
-            except: continue
-        
-        if not ob_list:
-            obi_resampled = pd.Series(0, index=ohlcv.index)
-        else:
-            obi_df = pd.DataFrame(ob_list).set_index('time').sort_index()
-            obi_resampled = obi_df['obi'].resample(f'{interval_ms}ms').last().ffill()
-            obi_resampled = obi_resampled.reindex(ohlcv.index, method='ffill').fillna(0)
-
-        # Combine Features
-        features_df = pd.DataFrame({
-            'rsi': rsi,
-            'obi': obi_resampled,
-            'tfi': tfi,
-            'volatility': rolling_std,
-            'close': ohlcv['close'], # kept for labeling, removed later
-            'high': ohlcv['high'],   # kept for labeling
-            'low': ohlcv['low']      # kept for labeling
-        }).dropna()
-
-        if features_df.empty: continue
-
-        # --- B. Triple Barrier Labeling ---
-        # We iterate to find the first barrier touch.
-        # This is slow in pure Python, but accurate.
-        
-        closes = features_df['close'].values
-        highs = features_df['high'].values
-        lows = features_df['low'].values
-        vols = features_df['volatility'].values
-        
-        labels = []
-        valid_indices = []
 
-        for i in range(len(features_df) - BARRIER_HORIZON):
-            current_price = closes[i]
-            current_vol = vols[i]
-            
-            # Dynamic Barriers
-            # If vol is very low, use a minimum floor to avoid noise
-            barrier_width = max(current_vol * BARRIER_MULTIPLIER, current_price * 0.002) # Min 0.2% move
-            
-            upper_barrier = current_price + barrier_width
-            lower_barrier = current_price - barrier_width
-            
-            label = 0 # Default: HOLD
-            
-            # Look ahead
-            for j in range(1, BARRIER_HORIZON + 1):
-                future_high = highs[i+j]
-                future_low = lows[i+j]
-                
-                # Check touches
-                touched_upper = future_high >= upper_barrier
-                touched_lower = future_low <= lower_barrier
-                
-                if touched_upper and touched_lower:
-                    # Touched both in same candle? rare. Assume volatility/chop -> HOLD or check close
-                    # For safety, let's call it HOLD (0) or invalid.
-                    break 
-                elif touched_upper:
-                    label = 1 # BUY
-                    break
-                elif touched_lower:
-                    label = 2 # SELL
-                    break
-            
-            labels.append(label)
-            valid_indices.append(i)
+    # Split order books once instead of masking the whole table for every symbol
+    ob_groups = dict(list(orderbook_df.groupby('symbol', sort=False)))
+    agg_groups = aggtrade_df.groupby('symbol')
 
-        # Extract X and y using valid indices
-        final_X = features_df.iloc[valid_indices][['rsi', 'obi', 'tfi', 'volatility']].values
-        final_y = np.array(labels)
-        
-        all_features.append(final_X)
-        all_labels.append(final_y)
+    results = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(process_symbol)(symbol, agg_group, ob_groups.get(symbol), cfg)
+        for symbol, agg_group in tqdm(agg_groups, total=agg_groups.ngroups, desc="Processing Symbols")
+    )
+    results = [r for r in results if r is not None]
 
-    if not all_features:
+    if not results:
         return np.array([]), np.array([])
 
-    X_concat = np.concatenate(all_features, axis=0)
-    y_concat = np.concatenate(all_labels, axis=0)
+    X_concat = np.concatenate([X for X, _ in results], axis=0)
+    y_concat = np.concatenate([y for _, y in results], axis=0)
     
     return X_concat, y_concat
 
@@ -271,15 +426,34 @@ def balance_dataset(X, y):
 # 5. Training Loop
 # ==========================================
 def train_real(X, y):
-    model = TradingModel()
+    # ROCm builds of PyTorch also expose the GPU through torch.cuda
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    use_cuda = device == 'cuda'
+    print(f"Using device: {device}")
+
+    if use_cuda:
+        torch.backends.cudnn.benchmark = True
+
+    # Train through the compiled wrapper; `model` shares its parameters and stays eager for ONNX export
+    model = TradingModel().to(device)
+    compiled_model = torch.compile(model, mode='reduce-overhead', fullgraph=True)
     # Weighted Loss? Since we manually balanced, standard CrossEntropy is fine.
     # But we can add slight weights if still uneven.
     criterion = nn.CrossEntropyLoss() 
     optimizer = optim.Adam(model.parameters(), lr=0.001)
     
     print("Training on balanced data...")
+    BATCH_SIZE = 4096
     dataset = TensorDataset(torch.from_numpy(X).float(), torch.from_numpy(y).long())
-    dataloader = DataLoader(dataset, batch_size=64, shuffle=True)
+    dataloader = DataLoader(
+        dataset,
+        batch_size=BATCH_SIZE,
+        shuffle=True,
+        pin_memory=use_cuda, # page-locked batches allow async host -> device copies
+        num_workers=4,
+        persistent_workers=True,
+        drop_last=len(dataset) > BATCH_SIZE # keep at least one batch on small datasets
+    )
     
     for epoch in range(50):
         total_loss = 0
@@ -287,8 +461,11 @@ def train_real(X, y):
         total = 0
         
         for batch_X, batch_y in dataloader:
-            optimizer.zero_grad()
-            outputs = model(batch_X)
+            batch_X = batch_X.to(device, non_blocking=True)
+            batch_y = batch_y.to(device, non_blocking=True)
+
+            optimizer.zero_grad(set_to_none=True)
+            outputs = compiled_model(batch_X)
             loss = criterion(outputs, batch_y)
             loss.backward()
             optimizer.step()
@@ -302,7 +479,8 @@ def train_real(X, y):
             acc = 100 * correct / total
             print(f"Epoch {epoch}, Loss: {total_loss/len(dataloader):.4f}, Acc: {acc:.2f}%")
 
-    return model
+    # Hand back a CPU model for ONNX export
+    return model.to('cpu')
 
 def export_onnx(model, path="models/strategy.onnx"):
     model.eval()
@@ -317,11 +495,19 @@ def export_onnx(model, path="models/strategy.onnx"):
         path,
         input_names=['input'],
         output_names=['output'],
-        dynamic_axes={'input': {0: 'batch_size'}, 'output': {0: 'batch_size'}},
-        dynamo=False
+        opset_version=17,
+        dynamic_shapes={'x': {0: torch.export.Dim('batch_size')}},
+        dynamo=True,
+        external_data=False # single-file model for tract
     )
     print("Success! Model exported.")
 
+    # Half-precision copy for fp16-capable runtimes; I/O stays fp32 so callers are unchanged
+    fp16_path = path.replace('.onnx', '.fp16.onnx')
+    model_fp16 = float16.convert_float_to_float16(onnx.load(path), keep_io_types=True)
+    onnx.save(model_fp16, fp16_path)
+    print(f"FP16 model exported to {fp16_path}.")
+
 # ==========================================
 # Main Execution
 # ==========================================